@@ -1,6 +1,7 @@
 # pylint: disable=all
 # type: ignore
 
+import queue
 import pyaudio
 import numpy as np
 from fft_engine import FFTAnalyzer
@@ -10,7 +11,18 @@ class AudioCapture:
     Captures real-time audio from microphone and analyzes it with FFT
     """
     
-    def __init__(self, sample_rate=44100, chunk_size=4096, device_index=None):
+    # A chunk whose RMS is within REPEAT_RMS_TOLERANCE and whose zero-crossing
+    # rate is within REPEAT_RATE_TOLERANCE (both relative) of the last
+    # analyzed one reuses that analysis instead of a new FFT. 5e-4 is under
+    # one cent, which keeps a reused fundamental within 0.1% (under 2 cents)
+    # of a fresh analysis of the same chunk, even during slow glides (see
+    # test_chunk_reuse.py). Chunks quieter than SILENCE_RMS (-60 dBFS) are
+    # all treated as repeats.
+    REPEAT_RMS_TOLERANCE = 0.02
+    REPEAT_RATE_TOLERANCE = 5e-4
+    SILENCE_RMS = 1e-3
+    
+    def __init__(self, sample_rate=44100, chunk_size=4096, device_index=None, hop_size=None):
         """
         Initialize audio capture
         
@@ -18,10 +30,42 @@ class AudioCapture:
         sample_rate: Audio sampling rate in Hz (default 44100)
         chunk_size: Number of samples per audio chunk (default 4096)
         device_index: Specific device index to use (None = default device)
+        hop_size: Number of new samples per analyzed chunk (None = chunk_size,
+                  no overlap; e.g. chunk_size // 2 for 50% overlap)
         """
+        if hop_size is None:
+            hop_size = chunk_size
+        if not 1 <= hop_size <= chunk_size:
+            raise ValueError(f"hop_size must be between 1 and chunk_size ({chunk_size}), got {hop_size}")
+        
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
-        self.analyzer = FFTAnalyzer(sample_rate=sample_rate)
+        self.hop_size = hop_size
+        self.analyzer = FFTAnalyzer(sample_rate=sample_rate, chunk_size=chunk_size)
+
+        # Analysis frame, updated in place by every read_chunk() call
+        self._float_buf = np.zeros(chunk_size, dtype=np.float32)
+
+        # Raw chunks handed over from PortAudio's callback thread, so capture
+        # keeps running while a chunk is being analyzed. Each is tagged with a
+        # sequence number so read_chunk can tell when one was dropped.
+        self._chunks = queue.Queue(maxsize=8)
+        self._hop_seq = 0
+        self._next_seq = 0
+        
+        # Contiguous hops currently in the analysis frame, and how many make
+        # up a full frame
+        self._frame_hops = 0
+        self._hops_per_frame = -(-chunk_size // self.hop_size)
+        
+        # Last analyzed chunk's level, zero-crossing rate and analysis, plus
+        # scratch buffers for finding crossings (see is_repeat_chunk)
+        self._last_rms = 0.0
+        self._last_rate = 0.0
+        self._last_result = None
+        self._last_stable = False
+        self._sign_buf = np.empty(chunk_size, dtype=bool)
+        self._crossing_buf = np.empty(chunk_size - 1, dtype=bool)
         
         self.audio = pyaudio.PyAudio()
         
@@ -31,7 +75,8 @@ class AudioCapture:
             rate=self.sample_rate,
             input=True,
             input_device_index=device_index,
-            frames_per_buffer=self.chunk_size
+            frames_per_buffer=self.hop_size,
+            stream_callback=self._audio_callback
         )
         
         device_name = "default"
@@ -39,7 +84,7 @@ class AudioCapture:
             device_info = self.audio.get_device_info_by_index(device_index)
             device_name = device_info['name']
         
-        print(f"Audio capture initialized: {sample_rate} Hz, chunk size {chunk_size}")
+        print(f"Audio capture initialized: {sample_rate} Hz, chunk size {chunk_size}, hop size {self.hop_size}")
         print(f"Using device: {device_name}")
     
     def list_audio_devices(self):
@@ -57,25 +102,142 @@ class AudioCapture:
                 print(f"Device {i}: {device_info['name']}")
         return devices
     
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """
+        PortAudio stream callback (runs on PortAudio's audio thread)
+        
+        Queues the raw chunk for read_chunk() and returns immediately. If the
+        consumer has fallen behind, the oldest chunk is dropped so analysis
+        always works on recent audio.
+        """
+        item = (self._hop_seq, in_data)
+        self._hop_seq += 1
+        
+        try:
+            self._chunks.put_nowait(item)
+        except queue.Full:
+            try:
+                self._chunks.get_nowait()
+            except queue.Empty:
+                pass
+            self._chunks.put_nowait(item)
+        
+        return (None, pyaudio.paContinue)
+    
     def read_chunk(self):
         """
         Read one chunk of audio from microphone
         
+        Blocks until the stream callback has delivered the next hop_size
+        samples. With overlap enabled, the returned chunk is the previous
+        chunk shifted left by hop_size with the new samples appended. At
+        startup, and whenever a hop was dropped, the frame is refilled with
+        enough new hops to cover it before a chunk is returned, so the chunk
+        never splices together audio that wasn't contiguous.
+        
+        The returned array is a buffer reused by the next call; copy it if
+        the samples are needed after the next chunk is read.
+        
         Returns:
         numpy array of audio samples (normalized to range -1.0 to 1.0)
         """
-        raw_data = self.stream.read(self.chunk_size, exception_on_overflow=False)
+        hop = self.hop_size
         
-        audio_data = np.frombuffer(raw_data, dtype=np.int16)
+        while True:
+            seq, raw_data = self._chunks.get()
+            if seq != self._next_seq:
+                self._frame_hops = 0
+            self._next_seq = seq + 1
+            
+            raw = np.frombuffer(raw_data, dtype=np.int16)
+
+            if hop < self.chunk_size:
+                self._float_buf[:-hop] = self._float_buf[hop:]
 
-        audio_data = audio_data.astype(np.float32) / 2**15
+            # Convert and scale in a single pass, without an intermediate array
+            np.multiply(raw, np.float32(1.0 / 2**15), out=self._float_buf[-hop:], casting='unsafe')
+            
+            self._frame_hops = min(self._frame_hops + 1, self._hops_per_frame)
+            if self._frame_hops == self._hops_per_frame:
+                return self._float_buf
+    
+    def zero_crossing_rate(self, audio_data):
+        """
+        Measure the rate of rising zero crossings in a chunk
+        
+        The rate is the number of intervals between the first and last rising
+        crossing divided by their distance, with both crossing positions
+        linearly interpolated between samples. It doesn't depend on where in
+        its cycle a sustained tone happens to start, and unlike a plain count
+        it varies continuously with pitch: for a tone with one rising
+        crossing per period it is f / sample_rate.
+        
+        Parameters:
+        audio_data: numpy array of audio samples
+        
+        Returns:
+        rising zero crossings per sample (0.0 if fewer than two)
+        """
+        # A rising crossing goes from a negative sample to a non-negative one
+        np.signbit(audio_data, out=self._sign_buf)
+        np.greater(self._sign_buf[:-1], self._sign_buf[1:], out=self._crossing_buf)
         
-        return audio_data
+        crossings = int(np.count_nonzero(self._crossing_buf))
+        if crossings < 2:
+            return 0.0
+        
+        first = int(np.argmax(self._crossing_buf))
+        last = len(self._crossing_buf) - 1 - int(np.argmax(self._crossing_buf[::-1]))
+        
+        span = self._crossing_position(audio_data, last) - self._crossing_position(audio_data, first)
+        return (crossings - 1) / span
+    
+    def _crossing_position(self, audio_data, i):
+        """
+        Interpolated position of the zero crossing between samples i and i + 1
+        """
+        a = float(audio_data[i])
+        b = float(audio_data[i + 1])
+        return i + (a / (a - b) if a != b else 0.5)
+    
+    def is_repeat_chunk(self, rms, rate):
+        """
+        Check whether a chunk is close enough to the last analyzed one to reuse its analysis
+        
+        Between note onsets the signal is nearly stationary, so adjacent
+        chunks give practically the same spectrum. Two chunks are treated as
+        repeats if both are below SILENCE_RMS, or if their RMS levels agree
+        within REPEAT_RMS_TOLERANCE and their zero-crossing rates within
+        REPEAT_RATE_TOLERANCE.
+        
+        Parameters:
+        rms: RMS level of the current chunk
+        rate: zero-crossing rate of the current chunk (see zero_crossing_rate)
+        
+        Returns:
+        True if the last analysis can be reused
+        """
+        if self._last_result is None:
+            return False
+        
+        if rms < self.SILENCE_RMS and self._last_rms < self.SILENCE_RMS:
+            return True
+        
+        if abs(rms - self._last_rms) > self.REPEAT_RMS_TOLERANCE * self._last_rms:
+            return False
+        
+        return abs(rate - self._last_rate) <= self.REPEAT_RATE_TOLERANCE * self._last_rate
     
     def analyze_chunk(self):
         """
         Read and analyze one chunk of audio
         
+        If the chunk repeats the last analyzed one (see is_repeat_chunk) and
+        that one in turn repeated its predecessor, the last analysis is
+        returned with the new audio_data and no FFT is computed. Requiring two
+        agreeing chunks keeps a chunk straddling a note change from being
+        reused for the note that follows it.
+        
         Returns:
         Dictionary with analysis results:
         - fundamental: fundamental frequency in Hz
@@ -83,23 +245,30 @@ class AudioCapture:
         - harmonics: list of (harmonic_number, frequency, magnitude)
         - frequencies: frequency array from FFT
         - magnitudes: magnitude array from FFT
-        - audio_data: raw audio samples
-        """
-        audio_data = self.read_chunk()
-        
-        frequencies, magnitudes = self.analyzer.compute_fft(audio_data)
-        fundamental = self.analyzer.find_fundamental_frequency(frequencies, magnitudes)
-        note = self.analyzer.frequency_to_note(fundamental)
-        harmonics = self.analyzer.find_harmonics(frequencies, magnitudes, fundamental)
-        
-        return {
-            'fundamental': fundamental,
-            'note': note,
-            'harmonics': harmonics,
-            'frequencies': frequencies,
-            'magnitudes': magnitudes,
-            'audio_data': audio_data
-        }
+        - audio_data: raw audio samples (a copy the caller may keep)
+        """
+        # read_chunk reuses its buffer for the next chunk, and the results
+        # are typically handed to another thread, so take a private copy
+        audio_data = self.read_chunk().copy()
+        
+        rms = float(np.sqrt(np.dot(audio_data, audio_data) / len(audio_data)))
+        rate = self.zero_crossing_rate(audio_data)
+        
+        repeat = self.is_repeat_chunk(rms, rate)
+        if repeat and self._last_stable:
+            results = dict(self._last_result)
+            results['audio_data'] = audio_data
+            return results
+        
+        results = self.analyzer.analyze(audio_data)
+        results['audio_data'] = audio_data
+        
+        self._last_rms = rms
+        self._last_rate = rate
+        self._last_result = results
+        self._last_stable = repeat
+        
+        return results
     
     def close(self):
         """
@@ -1,7 +1,10 @@
 # pylint: disable=all
 # type: ignore
 
+import bisect
+import math
 import numpy as np
+import scipy.fft
 from scipy import signal
 
 class FFTAnalyzer:
@@ -10,14 +13,70 @@ class FFTAnalyzer:
     frequencies, harmonics, and musical notes.
     """
 
-    def __init__(self, sample_rate=44100):
+    NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+    # Number of chunks analyze_batch windows and transforms per FFT call
+    BATCH_BLOCK_SIZE = 256
+
+    def __init__(self, sample_rate=44100, chunk_size=None):
         """
         Initialize the FFT analyzer
         
         Parameters:
         sample_rate: Audio sampling rate in Hz (default 44100, CD quality)
+        chunk_size: Expected samples per chunk; if given, the FFT plan and its
+                    buffers are allocated and the pipeline is run once on
+                    silence up front, so the first real chunk doesn't pay
+                    for setup
         """
         self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+
+        # Note names from C0 to B9 and the frequencies halfway (a quarter
+        # tone) between neighbouring notes, so frequency_to_note is a binary
+        # search instead of a logarithm
+        self._note_table = [self.NOTE_NAMES[m % 12] + str(m // 12) for m in range(120)]
+        self._note_bounds = [440.0 * 2 ** ((m - 57.5) / 12) for m in range(121)]
+
+        # FFT plans keyed by chunk length (see _get_plan)
+        self._plans = {}
+        if chunk_size is not None:
+            # Also builds pocketfft's cached twiddle factors for this length
+            self.analyze(np.zeros(chunk_size, dtype=np.float32))
+
+    def _get_plan(self, n):
+        """
+        Return the precomputed FFT state for chunks of length n
+
+        The plan is built on first use and reused for every later chunk of
+        the same length, so the Hann window, FFT size and frequency bins are
+        computed once and the windowing and magnitude buffers are allocated
+        once. Magnitudes alternate between two buffers, so the spectrum
+        returned by one call stays intact while the next one is computed.
+
+        Parameters:
+        n: number of samples per chunk
+
+        Returns:
+        dictionary with window, buffer, n_fft, frequencies, magnitude_ring
+        and ring_idx
+        """
+        plan = self._plans.get(n)
+        if plan is None:
+            # Zero-pad to a length pocketfft factors efficiently
+            n_fft = scipy.fft.next_fast_len(n, real=True)
+            plan = {
+                # Periodic (DFT-even) Hann window, the correct form for
+                # spectral analysis; np.hanning is the symmetric variant
+                'window': signal.windows.hann(n, sym=False).astype(np.float32),
+                'buffer': np.empty(n, dtype=np.float32),
+                'n_fft': n_fft,
+                'frequencies': scipy.fft.rfftfreq(n_fft, 1.0/self.sample_rate).astype(np.float32),
+                'magnitude_ring': [np.empty(n_fft // 2 + 1, dtype=np.float32),
+                                   np.empty(n_fft // 2 + 1, dtype=np.float32)],
+                'ring_idx': 0,
+            }
+            self._plans[n] = plan
+        return plan
     
     def compute_fft(self, audio_data):
         """
@@ -26,21 +85,39 @@ class FFTAnalyzer:
         Steps:
         1. Apply Hann window to audio data to reduce spectral leakage
         2. Compute FFT to transform time-domain signal to frequency domain
+           (zero-padded to the next fast FFT length if needed)
         3. Extract magnitude values from complex FFT output
         4. Calculate corresponding frequency bins
 
+        The returned arrays are owned by the analyzer. The magnitudes are
+        overwritten two calls later with the same chunk length, so a consumer
+        must finish reading them before then (or copy them).
+
+        The transform runs in single precision: samples are windowed into a
+        float32 buffer, so the FFT output is complex64 and the magnitudes are
+        float32 regardless of the input dtype. The frequency bins are float32
+        as well, so every array handed on to the display is single precision.
+
         Parameters:
         audio_data: numpy array of audio samples
 
         Returns:
-        frequencies: array of frequency bins in Hz
-        magnitudes: array of magnitude values for each frequency
+        frequencies: float32 array of frequency bins in Hz
+        magnitudes: float32 array of magnitude values for each frequency
         """
-        windowed_data = audio_data * np.hanning(len(audio_data))
-        fft_result = np.fft.rfft(windowed_data)
+        plan = self._get_plan(len(audio_data))
+
+        windowed_data = plan['buffer']
+        np.multiply(audio_data, plan['window'], out=windowed_data)
+        # The windowed buffer is scratch space, so pocketfft may reuse it
+        fft_result = scipy.fft.rfft(windowed_data, n=plan['n_fft'], overwrite_x=True)
         
-        magnitudes = np.abs(fft_result)
-        frequencies = np.fft.rfftfreq(len(audio_data), 1.0/self.sample_rate)
+        # np.abs on the complex output is a single SIMD pass; splitting it
+        # into real/imag views for np.hypot is several times slower
+        ring_idx = plan['ring_idx']
+        plan['ring_idx'] = 1 - ring_idx
+        magnitudes = np.abs(fft_result, out=plan['magnitude_ring'][ring_idx])
+        frequencies = plan['frequencies']
 
         return frequencies, magnitudes
 
@@ -53,7 +130,7 @@ class FFTAnalyzer:
         interpolation to achieve sub-bin frequency resolution.
         
         Algorithm:
-        1. Filter frequency spectrum to valid range (min_freq to max_freq)
+        1. Slice frequency spectrum to valid range (min_freq to max_freq)
         2. Identify the bin with maximum magnitude (strongest peak)
         3. Apply three-point parabolic interpolation around the peak using magnitudes
         at bins k-1, k, and k+1 to estimate the true peak frequency between bins
@@ -82,44 +159,45 @@ class FFTAnalyzer:
             Fundamental frequency in Hz with sub-bin accuracy from parabolic
             interpolation, or 0 if no valid frequencies found in the specified range
         """
-        mask = (frequencies >= min_freq) & (frequencies <= max_freq)
-        
-        valid_freqs = frequencies[mask]
-        valid_mags = magnitudes[mask]
+        if len(frequencies) < 2:
+            return 0
 
-        if len(valid_mags) == 0:
+        # Bins are evenly spaced, so the valid range is a contiguous slice
+        freq_spacing = float(frequencies[1] - frequencies[0])
+        lo = max(int(np.ceil(min_freq / freq_spacing)), 0)
+        hi = min(int(np.floor(max_freq / freq_spacing)) + 1, len(magnitudes))
+
+        if hi <= lo:
             return 0
         
         # Find the STRONGEST peak (simplest approach)
-        peak_idx = np.argmax(valid_mags)
-        fundamental = valid_freqs[peak_idx]
+        peak_idx = lo + int(np.argmax(magnitudes[lo:hi]))
+        fundamental = float(frequencies[peak_idx])
         
-        # Apply parabolic interpolation for sub-bin accuracy
-        if peak_idx > 0 and peak_idx < len(valid_mags) - 1:
+        # Apply parabolic interpolation for sub-bin accuracy, on plain Python
+        # floats (much cheaper than numpy scalars). Skipped when the peak is on
+        # either edge of [min_freq, max_freq], as in the slice-free version.
+        if lo < peak_idx < hi - 1:
             # Get three points around the peak
-            alpha = valid_mags[peak_idx - 1]
-            beta = valid_mags[peak_idx]
-            gamma = valid_mags[peak_idx + 1]
+            alpha = float(magnitudes[peak_idx - 1])
+            beta = float(magnitudes[peak_idx])
+            gamma = float(magnitudes[peak_idx + 1])
             
             # Calculate parabolic offset
-            denominator = alpha - 2 * beta + gamma
+            denominator = alpha - 2.0 * beta + gamma
             
             if abs(denominator) > 1e-10:  # Avoid division by zero
                 delta = 0.5 * (alpha - gamma) / denominator
                 
                 # Clamp delta to prevent wild overshoots
-                delta = np.clip(delta, -0.5, 0.5)
+                delta = max(-0.5, min(0.5, delta))
                 
-                # Get frequency bin spacing
-                if len(frequencies) > 1:
-                    freq_spacing = frequencies[1] - frequencies[0]
-                    
-                    # Calculate interpolated frequency
-                    fundamental = fundamental + delta * freq_spacing
+                # Calculate interpolated frequency
+                fundamental = fundamental + delta * freq_spacing
         
         return fundamental
     
-    def find_harmonics(self, frequencies, magnitudes, fundamental, num_harmonics=5):
+    def find_harmonics(self, frequencies, magnitudes, fundamental, num_harmonics=5, search_bins=2):
         """
         Find harmonic series based on fundamental frequency
         
@@ -127,38 +205,52 @@ class FFTAnalyzer:
         1. For each harmonic number (1, 2, 3, 4, 5...)
         2. Calculate expected frequency (fundamental × harmonic_number)
         3. Find the closest actual frequency in FFT output
-        4. Store the harmonic number, frequency, and magnitude
+           (bins are evenly spaced, so this is expected_freq / bin spacing
+           rounded to the nearest bin)
+        4. Take the strongest bin within search_bins of it, since small errors
+           in the fundamental grow with the harmonic number and real strings
+           are slightly inharmonic
+        5. Store the harmonic number, frequency, and magnitude
+        
+        All harmonics are searched together in one vectorized gather.
         
         Parameters:
         frequencies: frequency array from FFT
         magnitudes: magnitude array from FFT  
         fundamental: fundamental frequency in Hz
         num_harmonics: number of harmonics to find (default 5)
+        search_bins: bins searched on each side of the expected bin
+                     (default 2; 0 takes the nearest bin)
         
         Returns:
         list of (harmonic_number, frequency, magnitude) tuples
         """
-        harmonics = []
+        harmonic_numbers = np.arange(1, num_harmonics + 1)
+        freq_spacing = frequencies[1] - frequencies[0]
 
-        for i in range(1, num_harmonics + 1):
-            expected_freq = fundamental * i
-            
-            idx = np.argmin(np.abs(frequencies - expected_freq))
-            actual_freq = frequencies[idx]
-            magnitude = magnitudes[idx]
+        # Nearest bin for every harmonic at once
+        idx = np.rint(harmonic_numbers * fundamental / freq_spacing).astype(np.int64)
 
-            harmonics.append((i, actual_freq, magnitude))
-        
-        return harmonics
+        # Strongest bin in the window around each expected bin
+        candidates = idx[:, np.newaxis] + np.arange(-search_bins, search_bins + 1)
+        np.clip(candidates, 0, len(frequencies) - 1, out=candidates)
+        best = np.argmax(magnitudes[candidates], axis=1)
+        idx = candidates[np.arange(num_harmonics), best]
+
+        return list(zip(harmonic_numbers.tolist(),
+                        frequencies[idx].tolist(),
+                        magnitudes[idx].tolist()))
     
     def frequency_to_note(self, frequency):
         """
         Convert frequency to musical note name
         
-        Steps:
+        Notes from C0 to B9 are looked up in a precomputed table by binary
+        search over the quarter-tone boundaries between them. Outside that
+        range the note is calculated directly:
         1. Calculate semitones away from A4 (440 Hz) using logarithm
-        2. Determine octave number from semitone offset
-        3. Determine note position within octave
+        2. Offset to semitones above C0 (A4 is 57 semitones above C0)
+        3. Determine octave number and note position within octave
         4. Return note name with octave
         
         Parameters:
@@ -170,19 +262,186 @@ class FFTAnalyzer:
         if frequency <= 0:
             return "N/A"
         
-        A4 = 440.0
-        notes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-
-        half_steps = 12 * np.log2(frequency / A4)
-
-        octave = 4 + int(np.round(half_steps)) // 12
-        note_idx = (int(np.round(half_steps)) + 9) % 12
-
-        if note_idx < 0:
-            note_idx += 12
-            octave -= 1
+        bounds = self._note_bounds
+        if bounds[0] <= frequency < bounds[-1]:
+            return self._note_table[bisect.bisect_right(bounds, frequency) - 1]
+        
+        semitones = round(12 * math.log2(frequency / 440.0)) + 57
+        
+        return self.NOTE_NAMES[semitones % 12] + str(semitones // 12)
+    
+    def analyze(self, audio_data, min_freq=50, max_freq=2000, num_harmonics=5):
+        """
+        Run the full analysis pipeline on one chunk of audio
+        
+        Steps:
+        1. Compute the magnitude spectrum (compute_fft)
+        2. Find the fundamental frequency (find_fundamental_frequency)
+        3. Convert it to a note name (frequency_to_note)
+        4. Find its harmonic series (find_harmonics)
+        
+        Every stage works on the same spectrum buffers, so a chunk is
+        analyzed with a single call and no intermediate copies.
+        
+        Parameters:
+        audio_data: numpy array of audio samples
+        min_freq: minimum fundamental frequency in Hz (default 50)
+        max_freq: maximum fundamental frequency in Hz (default 2000)
+        num_harmonics: number of harmonics to find (default 5)
+        
+        Returns:
+        Dictionary with analysis results:
+        - fundamental: fundamental frequency in Hz
+        - note: note name
+        - harmonics: list of (harmonic_number, frequency, magnitude)
+        - frequencies: frequency array from FFT
+        - magnitudes: magnitude array from FFT
+        """
+        frequencies, magnitudes = self.compute_fft(audio_data)
+        fundamental = self.find_fundamental_frequency(frequencies, magnitudes, min_freq, max_freq)
+        note = self.frequency_to_note(fundamental)
+        harmonics = self.find_harmonics(frequencies, magnitudes, fundamental, num_harmonics)
+        
+        return {
+            'fundamental': fundamental,
+            'note': note,
+            'harmonics': harmonics,
+            'frequencies': frequencies,
+            'magnitudes': magnitudes
+        }
+    
+    def analyze_batch(self, audio_data, chunk_size=None, hop_size=None, min_freq=50, max_freq=2000, num_harmonics=5):
+        """
+        Analyze a long recording as a series of overlapping chunks
+        
+        Steps:
+        1. Split the recording into chunks of chunk_size samples, hop_size apart
+           (strided views, no copies)
+        2. Window the chunks and compute their FFTs in blocks of
+           BATCH_BLOCK_SIZE chunks per batched call, which pocketfft spreads
+           across all CPU cores; the blocks bound the working memory
+        3. Find the fundamentals and harmonics of a whole block at once
+           (_batch_fundamentals, _batch_harmonics), then each chunk's note
+        
+        Results match analyze() on each chunk.
+        
+        Parameters:
+        audio_data: numpy array of audio samples
+        chunk_size: number of samples per analyzed chunk (default: the
+                    analyzer's chunk_size, or 4096 if it was built without one)
+        hop_size: number of samples between chunk starts
+                  (default chunk_size // 2, 50% overlap)
+        min_freq: minimum fundamental frequency in Hz (default 50)
+        max_freq: maximum fundamental frequency in Hz (default 2000)
+        num_harmonics: number of harmonics to find (default 5)
+        
+        Returns:
+        list with one dictionary per chunk, with the same keys as analyze()
+        (frequencies is shared; magnitudes is that chunk's row of its block)
+        """
+        if chunk_size is None:
+            chunk_size = self.chunk_size or 4096
+        if hop_size is None:
+            hop_size = max(chunk_size // 2, 1)
+        if hop_size < 1:
+            raise ValueError(f"hop_size must be at least 1, got {hop_size}")
+        if len(audio_data) < chunk_size:
+            return []
+        
+        plan = self._get_plan(chunk_size)
+        frequencies = plan['frequencies']
+        
+        frames = np.lib.stride_tricks.sliding_window_view(audio_data, chunk_size)[::hop_size]
+        windowed = np.empty((min(len(frames), self.BATCH_BLOCK_SIZE), chunk_size), dtype=np.float32)
+        
+        results = []
+        for start in range(0, len(frames), self.BATCH_BLOCK_SIZE):
+            block = frames[start:start + self.BATCH_BLOCK_SIZE]
+            block_windowed = windowed[:len(block)]
+            np.multiply(block, plan['window'], out=block_windowed, casting='same_kind')
+            spectra = scipy.fft.rfft(block_windowed, n=plan['n_fft'], axis=-1, workers=-1)
+            
+            all_magnitudes = np.abs(spectra)
+            
+            fundamentals = self._batch_fundamentals(frequencies, all_magnitudes, min_freq, max_freq)
+            harmonics = self._batch_harmonics(frequencies, all_magnitudes, fundamentals, num_harmonics)
+            
+            for fundamental, chunk_harmonics, magnitudes in zip(fundamentals.tolist(), harmonics, all_magnitudes):
+                results.append({
+                    'fundamental': fundamental,
+                    'note': self.frequency_to_note(fundamental),
+                    'harmonics': chunk_harmonics,
+                    'frequencies': frequencies,
+                    'magnitudes': magnitudes
+                })
         
-        return f"{notes[note_idx]}{octave}"
+        return results
+    
+    def _batch_fundamentals(self, frequencies, all_magnitudes, min_freq, max_freq):
+        """
+        find_fundamental_frequency for every row of a block of spectra
+        
+        The peak search is one argmax over the valid slice of all rows, and
+        the parabolic interpolation is done on whole columns, in float64 like
+        the per-chunk version so the results are identical.
+        
+        Returns:
+        float64 array with one fundamental frequency per row
+        """
+        fundamentals = np.zeros(len(all_magnitudes))
+        if len(frequencies) < 2:
+            return fundamentals
+        
+        freq_spacing = float(frequencies[1] - frequencies[0])
+        lo = max(int(np.ceil(min_freq / freq_spacing)), 0)
+        hi = min(int(np.floor(max_freq / freq_spacing)) + 1, all_magnitudes.shape[1])
+        
+        if hi <= lo:
+            return fundamentals
+        
+        peak_idx = lo + np.argmax(all_magnitudes[:, lo:hi], axis=1)
+        fundamentals[:] = frequencies[peak_idx]
+        
+        # Same edge rule as find_fundamental_frequency: interpolate only
+        # peaks strictly inside the searched range
+        rows = np.flatnonzero((peak_idx > lo) & (peak_idx < hi - 1))
+        interior = peak_idx[rows]
+        alpha = all_magnitudes[rows, interior - 1].astype(np.float64)
+        beta = all_magnitudes[rows, interior].astype(np.float64)
+        gamma = all_magnitudes[rows, interior + 1].astype(np.float64)
+        
+        denominator = alpha - 2.0 * beta + gamma
+        valid = np.abs(denominator) > 1e-10
+        delta = 0.5 * (alpha[valid] - gamma[valid]) / denominator[valid]
+        np.clip(delta, -0.5, 0.5, out=delta)
+        fundamentals[rows[valid]] += delta * freq_spacing
+        
+        return fundamentals
+    
+    def _batch_harmonics(self, frequencies, all_magnitudes, fundamentals, num_harmonics=5, search_bins=2):
+        """
+        find_harmonics for every row of a block of spectra, in one 2-D gather
+        
+        Returns:
+        list with one list of (harmonic_number, frequency, magnitude) tuples
+        per row
+        """
+        harmonic_numbers = np.arange(1, num_harmonics + 1)
+        freq_spacing = frequencies[1] - frequencies[0]
+        
+        # Nearest bin of every harmonic of every row: (rows, harmonics)
+        idx = np.rint(harmonic_numbers * fundamentals[:, np.newaxis] / freq_spacing).astype(np.int64)
+        
+        # Strongest bin in the window around each: (rows, harmonics, window)
+        candidates = idx[:, :, np.newaxis] + np.arange(-search_bins, search_bins + 1)
+        np.clip(candidates, 0, len(frequencies) - 1, out=candidates)
+        rows = np.arange(len(all_magnitudes))[:, np.newaxis]
+        best = np.argmax(all_magnitudes[rows[:, :, np.newaxis], candidates], axis=2)
+        idx = np.take_along_axis(candidates, best[:, :, np.newaxis], axis=2)[:, :, 0]
+        
+        numbers = harmonic_numbers.tolist()
+        return [list(zip(numbers, freqs, mags))
+                for freqs, mags in zip(frequencies[idx].tolist(), all_magnitudes[rows, idx].tolist())]
     
     '''
     # COMMENTED OUT: Multi-note detection (experimental)
@@ -206,6 +465,8 @@ class FFTAnalyzer:
         Returns:
         list of fundamental frequencies in Hz
         """
+        from scipy import ndimage
+        
         # Filter to valid frequency range
         mask = (frequencies >= min_freq) & (frequencies <= max_freq)
         valid_freqs = frequencies[mask]
@@ -214,14 +475,22 @@ class FFTAnalyzer:
         if len(valid_mags) == 0:
             return []
         
-        # Find peaks using scipy
+        # Find peaks with vectorized passes instead of signal.find_peaks:
+        # local maxima above the height threshold, keeping those with no
+        # higher local maximum less than 10 bins away (find_peaks' distance),
+        # then the same prominence test on just those peaks. Unlike
+        # find_peaks, a peak is also dropped when the higher one that
+        # suppresses it was itself suppressed (see THEORY.md).
         max_mag = np.max(valid_mags)
-        peaks, properties = signal.find_peaks(
-            valid_mags,
-            prominence=max_mag * 0.15,
-            height=max_mag * 0.3,
-            distance=10
-        )
+        candidates = np.zeros(len(valid_mags), dtype=bool)
+        candidates[1:-1] = ((valid_mags[1:-1] > valid_mags[:-2])
+                            & (valid_mags[1:-1] > valid_mags[2:])
+                            & (valid_mags[1:-1] > max_mag * 0.3))
+        candidate_mags = np.where(candidates, valid_mags, 0)
+        neighborhood_max = ndimage.maximum_filter1d(candidate_mags, size=19, mode='constant')
+        peaks = np.flatnonzero(candidates & (valid_mags == neighborhood_max))
+        prominences = signal.peak_prominences(valid_mags, peaks)[0]
+        peaks = peaks[prominences >= max_mag * 0.15]
         
         if len(peaks) == 0:
             return []
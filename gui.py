@@ -8,6 +8,8 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import numpy as np
 from audio_capture import AudioCapture
+import collections
+import math
 import threading
 
 class FFTAnalyzerGUI:
@@ -28,13 +30,32 @@ class FFTAnalyzerGUI:
         self.root.configure(bg='#1e1e1e')
         
         self.capture = AudioCapture()
-        self.running = False
+        
+        # Latest analysis result from the audio thread; older ones are dropped
+        self._latest = collections.deque(maxlen=1)
+        self._poll_id = None
+        
+        # Text currently shown in the note and frequency labels
+        self._last_note = None
+        self._last_freq = None
         
         self.background = None
-        self.background_wave = None
-        self.background_spectrum = None
+        
+        # Spectrum y-limits are powers of two; full-figure blit background
+        # per limit, cleared whenever the canvas is resized
+        self._ylim_level = None
+        self._background_cache = {}
+        
+        # Spectrum plotting layout and buffers (see layout_spectrum)
+        self._spectrum_freqs = None
         
         self.setup_style()
+        
+        # One long-lived audio thread, paused and resumed by this event;
+        # started last, once all the state it touches exists
+        self._run_event = threading.Event()
+        self.thread = threading.Thread(target=self.process_audio, daemon=True)
+        self.thread.start()
     
     def setup_style(self):
         """
@@ -79,20 +100,26 @@ class FFTAnalyzerGUI:
         self.ax_wave.set_xlabel('Time (samples)', color='#ffffff', fontsize=10)
         self.ax_wave.set_ylabel('Amplitude', color='#ffffff', fontsize=10)
         self.ax_wave.set_title('Waveform', color='#00d4ff', fontsize=12, fontweight='bold')
+        self.ax_wave.set_xlim(0, self.capture.chunk_size)
         self.ax_wave.set_ylim(-1, 1)
         self.ax_wave.grid(True, alpha=0.3, color='#444444')
         self.ax_wave.tick_params(colors='#ffffff', labelsize=8)
-        self.waveform_line, = self.ax_wave.plot([], [], '#00ff88', linewidth=1, animated=True)
+        
+        # Chunks are always chunk_size samples long, so the x-data is set once
+        # here and only the y-data changes per frame
+        self._time_axis = np.arange(self.capture.chunk_size, dtype=np.float32)
+        self.waveform_line, = self.ax_wave.plot(self._time_axis, np.zeros_like(self._time_axis),
+                                                '#00ff88', linewidth=1, animated=True, antialiased=False)
         
         self.ax_spectrum = self.fig.add_subplot(212, facecolor='#2d2d2d')
         self.ax_spectrum.set_xlabel('Frequency (Hz)', color='#ffffff', fontsize=10)
         self.ax_spectrum.set_ylabel('Magnitude', color='#ffffff', fontsize=10)
         self.ax_spectrum.set_title('Frequency Spectrum', color='#00d4ff', fontsize=12, fontweight='bold')
         self.ax_spectrum.set_xlim(0, 2000)
-        self.ax_spectrum.set_ylim(0, 1000)
+        self.ax_spectrum.set_ylim(0, 1024)
         self.ax_spectrum.grid(True, alpha=0.3, color='#444444')
         self.ax_spectrum.tick_params(colors='#ffffff', labelsize=8)
-        self.spectrum_line, = self.ax_spectrum.plot([], [], '#ff4444', linewidth=2, animated=True)
+        self.spectrum_line, = self.ax_spectrum.plot([], [], '#ff4444', linewidth=2, animated=True, antialiased=False)
         
         self.fig.tight_layout(pad=2)
         
@@ -102,32 +129,94 @@ class FFTAnalyzerGUI:
         canvas_widget.configure(bg='#1e1e1e')
         canvas_widget.grid(row=2, column=0, padx=20, pady=10)
         
-        self.canvas.draw()
-        self.background_wave = self.canvas.copy_from_bbox(self.ax_wave.bbox)
-        self.background_spectrum = self.canvas.copy_from_bbox(self.ax_spectrum.bbox)
+        # Both axes are pushed to Tk in a single blit per frame
+        self._full_bbox = self.fig.bbox
+        
+        self.canvas.mpl_connect('resize_event', self.on_resize)
+        self.set_spectrum_level(1024)
+    
+    def set_spectrum_level(self, level):
+        """
+        Set the spectrum y-limit and switch to the matching blit background
+        
+        The background covers the whole figure, so it includes the y tick
+        labels for that limit. It is captured with a full redraw the first
+        time the limit is used and restored from the cache afterwards, so a
+        signal that drifts between levels doesn't redraw every time.
+        
+        Parameters:
+        level: upper y-limit of the spectrum plot (a power of two)
+        """
+        self._ylim_level = level
+        self.ax_spectrum.set_ylim(0, level)
+        
+        background = self._background_cache.get(level)
+        if background is None:
+            self.canvas.draw()
+            background = self.canvas.copy_from_bbox(self._full_bbox)
+            self._background_cache[level] = background
+        
+        self.background = background
+    
+    def on_resize(self, event):
+        """
+        Drop cached blit backgrounds when the canvas changes size
+        
+        Parameters:
+        event: matplotlib resize event
+        """
+        self._background_cache.clear()
+        self.background = None
     
     def toggle_analysis(self):
         """
         Start or stop the audio analysis
         """
-        if not self.running:
-            self.running = True
+        if not self._run_event.is_set():
             self.start_button.config(text="⏸ Stop")
             
-            self.thread = threading.Thread(target=self.process_audio, daemon=True)
-            self.thread.start()
+            self._latest.clear()
+            self._run_event.set()
+            self._poll_id = self.root.after(16, self.poll_results)
         else:
-            self.running = False
+            self._run_event.clear()
             self.start_button.config(text="▶ Start")
+            
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
     
     def process_audio(self):
         """
         Main audio processing loop (runs in separate thread)
+        
+        The thread is started once and lives for the whole session; Stop
+        only pauses it on _run_event, so Start doesn't spawn a new thread.
+        
+        The heavy stages of analyze_chunk() (NumPy ufuncs over the chunk and
+        scipy's pocketfft transform) run with the GIL released, so they
+        overlap with the Tk main loop's blits rather than stalling them.
         """
-        while self.running:
+        while True:
+            self._run_event.wait()
+            
             results = self.capture.analyze_chunk()
             
-            self.root.after(0, self.update_display, results)
+            if self._run_event.is_set():
+                self._latest.append(results)
+    
+    def poll_results(self):
+        """
+        Draw the most recent analysis result at most once per display frame
+        
+        Runs on the Tk main loop about 60 times a second while analysis is
+        running. Results produced faster than that replace each other in a
+        one-slot deque, so Tk's event queue never backs up and the display
+        always shows the latest chunk.
+        """
+        if self._latest:
+            self.update_display(self._latest.pop())
+        
+        self._poll_id = self.root.after(16, self.poll_results)
     
     def update_display(self, results):
         """
@@ -143,48 +232,114 @@ class FFTAnalyzerGUI:
         audio_data = results['audio_data']
         
         if fundamental > 0:
-            self.note_label.config(text=note)
-            self.freq_label.config(text=f"{fundamental:.2f} Hz")
+            note_text = note
+            freq_text = f"{fundamental:.2f} Hz"
         else:
-            self.note_label.config(text="--")
-            self.freq_label.config(text="--- Hz")
+            note_text = "--"
+            freq_text = "--- Hz"
+        
+        # Only touch the labels when their text changes; every config call
+        # makes Tk recompute geometry and redraw the widget
+        if note_text != self._last_note:
+            self.note_label.config(text=note_text)
+            self._last_note = note_text
+        if freq_text != self._last_freq:
+            self.freq_label.config(text=freq_text)
+            self._last_freq = freq_text
+        
+        self.waveform_line.set_ydata(audio_data)
         
-        time_axis = np.arange(len(audio_data))
-        self.waveform_line.set_data(time_axis, audio_data)
-        self.ax_wave.set_xlim(0, len(audio_data))
+        _, plot_mags = self.downsample_spectrum(frequencies, magnitudes)
         
-        mask = magnitudes > 10
-        filtered_freqs = frequencies[mask]
-        filtered_mags = magnitudes[mask]
+        # The peak decides both whether anything clears the noise floor and
+        # the y-limit, so take it in one pass before masking
+        max_mag = float(np.max(plot_mags))
         
-        self.spectrum_line.set_data(filtered_freqs, filtered_mags)
+        # Hide bins at or below the noise floor as NaN gaps, in place
+        np.less_equal(plot_mags, 10, out=self._plot_mask)
+        np.copyto(plot_mags, np.nan, where=self._plot_mask)
         
-        if len(filtered_mags) > 0:
-            max_mag = np.max(filtered_mags)
-            current_ylim = self.ax_spectrum.get_ylim()[1]
-            if max_mag > current_ylim * 0.9 or max_mag < current_ylim * 0.3:
-                self.ax_spectrum.set_ylim(0, max_mag * 1.1)
-                self.canvas.draw()
-                self.background_wave = self.canvas.copy_from_bbox(self.ax_wave.bbox)
-                self.background_spectrum = self.canvas.copy_from_bbox(self.ax_spectrum.bbox)
-                return
+        self.spectrum_line.set_ydata(plot_mags)
         
-        self.canvas.restore_region(self.background_wave)
-        self.canvas.restore_region(self.background_spectrum)
+        if max_mag > 10:
+            # Smallest power of two (at least 16) with 10% headroom; only
+            # step down once the peak is well below the current limit, so a
+            # peak near a boundary doesn't flip the scale every frame
+            level = 1 << max(4, math.ceil(math.log2(max_mag * 1.1)))
+            if level > self._ylim_level or level * 4 <= self._ylim_level:
+                self.set_spectrum_level(level)
+        
+        if self.background is None:
+            self.set_spectrum_level(self._ylim_level)
+        
+        self.canvas.restore_region(self.background)
         
         self.ax_wave.draw_artist(self.waveform_line)
         self.ax_spectrum.draw_artist(self.spectrum_line)
         
-        self.canvas.blit(self.ax_wave.bbox)
-        self.canvas.blit(self.ax_spectrum.bbox)
+        self.canvas.blit(self._full_bbox)
+    
+    def layout_spectrum(self, frequencies):
+        """
+        Precompute how the spectrum is reduced for plotting
+        
+        Bins beyond the visible frequency range are dropped. If more bins
+        remain than the spectrum axes is wide in pixels, they are grouped
+        into buckets and each bucket keeps its maximum, so peaks stay visible.
+        The bin centers are fixed for a given FFT size, so this runs once and
+        the plotted x-values and buffers are reused on every frame.
+        
+        Parameters:
+        frequencies: frequency array from FFT
+        """
+        x_max = self.ax_spectrum.get_xlim()[1]
+        n_visible = min(int(np.searchsorted(frequencies, x_max)) + 1, len(frequencies))
+        n_pixels = max(int(self.ax_spectrum.bbox.width), 1)
+        bucket = -(-n_visible // n_pixels)
+        n_points = -(-n_visible // bucket)
+        
+        self._spectrum_freqs = frequencies
+        self._n_visible = n_visible
+        self._bucket = bucket
+        self._plot_freqs = frequencies[:n_visible:bucket]
+        self._plot_mags = np.empty(n_points, dtype=np.float32)
+        self._plot_mask = np.empty(n_points, dtype=bool)
+        self._bucket_buf = None
+        if bucket > 1:
+            self._bucket_buf = np.full(n_points * bucket, -np.inf, dtype=np.float32)
+        
+        # The x-data only changes with the layout; frames just set the y-data
+        self.spectrum_line.set_data(self._plot_freqs, self._plot_mags)
+    
+    def downsample_spectrum(self, frequencies, magnitudes):
+        """
+        Reduce the spectrum to at most one point per pixel for plotting
+        
+        Parameters:
+        frequencies: frequency array from FFT
+        magnitudes: magnitude array from FFT
+        
+        Returns:
+        frequencies, magnitudes reduced for display (reused buffers, see
+        layout_spectrum)
+        """
+        if frequencies is not self._spectrum_freqs:
+            self.layout_spectrum(frequencies)
+        
+        visible = magnitudes[:self._n_visible]
+        if self._bucket > 1:
+            self._bucket_buf[:self._n_visible] = visible
+            np.max(self._bucket_buf.reshape(-1, self._bucket), axis=1, out=self._plot_mags)
+        else:
+            np.copyto(self._plot_mags, visible)
         
-        self.canvas.flush_events()
+        return self._plot_freqs, self._plot_mags
     
     def close(self):
         """
         Clean up when closing the application
         """
-        self.running = False
+        self._run_event.clear()
         self.capture.close()
         self.root.quit()
 
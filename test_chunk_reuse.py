@@ -0,0 +1,54 @@
+# pylint: disable=all
+# type: ignore
+
+import numpy as np
+from audio_capture import AudioCapture
+from fft_engine import FFTAnalyzer
+
+# Feed synthetic tones through the stream callback instead of the microphone
+capture = AudioCapture()
+capture.stream.stop_stream()
+while not capture._chunks.empty():
+    capture._chunks.get_nowait()
+
+reference = FFTAnalyzer(sample_rate=capture.sample_rate, chunk_size=capture.chunk_size)
+
+# A reused analysis must stay within 0.1% (under 2 cents) of a fresh one
+max_relative_error = 1e-3
+
+def run_tone(name, start_freq, end_freq, duration):
+    """
+    Play a constant-level tone gliding from start_freq to end_freq and
+    compare every reused analysis with a fresh one of the same chunk
+    """
+    sample_rate = capture.sample_rate
+    chunk_size = capture.chunk_size
+
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    freq = start_freq + (end_freq - start_freq) * t / duration
+    phase = 2 * np.pi * np.cumsum(freq) / sample_rate
+    samples = (0.3 * np.sin(phase) * 2**15).astype(np.int16)
+
+    reused = 0
+    worst = 0.0
+    for start in range(0, len(samples) - chunk_size + 1, chunk_size):
+        capture._audio_callback(samples[start:start + chunk_size].tobytes(), chunk_size, None, 0)
+        previous = capture._last_result
+        results = capture.analyze_chunk()
+
+        if capture._last_result is previous:
+            reused += 1
+            fresh = reference.analyze(results['audio_data'])['fundamental']
+            worst = max(worst, abs(results['fundamental'] - fresh) / fresh)
+
+    chunks = len(samples) // chunk_size
+    print(f"{name}: reused {reused}/{chunks} chunks, worst error {worst * 100:.3f}%")
+    assert worst <= max_relative_error, f"{name}: reused fundamental off by {worst * 100:.3f}%"
+
+run_tone("Sustained A4", 440.0, 440.0, 10.0)
+run_tone("Sustained G3", 196.0, 196.0, 10.0)
+run_tone("Glide G3 196 -> 206 Hz over 10 s", 196.0, 206.0, 10.0)
+run_tone("Glide A4 440 -> 450 Hz over 5 s", 440.0, 450.0, 5.0)
+run_tone("Glide A4 440 -> 450 Hz over 10 s", 440.0, 450.0, 10.0)
+
+capture.close()
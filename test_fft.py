@@ -11,7 +11,8 @@ frequency = 440.0  # A4 note
 
 t = np.linspace(0, duration, int(sample_rate * duration))
 
-audio_data = np.sin(2 * np.pi * frequency * t)
+# float32, matching the samples delivered by AudioCapture
+audio_data = np.sin(2 * np.pi * frequency * t).astype(np.float32)
 
 analyzer = FFTAnalyzer(sample_rate=sample_rate)
 
@@ -28,4 +29,11 @@ print(f"Detected note: {note}")
 harmonics = analyzer.find_harmonics(frequencies, magnitudes, fundamental)
 print(f"\nHarmonics:")
 for n, freq, mag in harmonics:
-    print(f"  Harmonic {n}: {freq:.2f} Hz (magnitude: {mag:.2f})")
\ No newline at end of file
+    print(f"  Harmonic {n}: {freq:.2f} Hz (magnitude: {mag:.2f})")
+
+# Analyze the same tone as overlapping 4096-sample chunks in one batch
+batch = analyzer.analyze_batch(audio_data, chunk_size=4096, hop_size=2048)
+batch_freqs = [r['fundamental'] for r in batch]
+print(f"\nBatch analysis: {len(batch)} chunks")
+print(f"  Detected frequency range: {min(batch_freqs):.2f} - {max(batch_freqs):.2f} Hz")
+print(f"  Detected notes: {sorted(set(r['note'] for r in batch))}")
\ No newline at end of file
@@ -1,8 +1,6 @@
 # pylint: disable=all
 # type: ignore
 
-import time
-import numpy as np
 from audio_capture import AudioCapture
 
 capture = AudioCapture()
@@ -11,6 +9,7 @@ print("\nPlay your violin! Press Ctrl+C to stop.\n")
 
 try:
     while True:
+        # Blocks until the stream delivers the next chunk
         results = capture.analyze_chunk()
         
         if results['fundamental'] > 0:
@@ -18,13 +17,12 @@ try:
             freqs = results['frequencies']
             mags = results['magnitudes']
             
-            idx = np.argmin(np.abs(freqs - fund_freq))
+            # Bins are evenly spaced, so the nearest bin is a direct index
+            idx = min(int(round(fund_freq / (freqs[1] - freqs[0]))), mags.size - 1)
             fundamental_magnitude = mags[idx]
             
             if fundamental_magnitude > 9:
                 print(f"Note: {results['note']:4s} | Frequency: {results['fundamental']:7.2f} Hz | Mag: {fundamental_magnitude:.0f}")
-        
-        time.sleep(0.1)
 
 except KeyboardInterrupt:
     print("\nStopping...")